@@ -1,6 +1,8 @@
 import sys
 import subprocess
 import os
+import time
+import glob
 import re
 import json
 
@@ -193,6 +195,10 @@ class Parser:
         
         method = self.expect('ID')
         
+        # Static file route: route "/docs" GET FILE "openapi.json"
+        if self.peek() and self.peek()[0] == 'ID' and self.peek()[1] == 'FILE':
+            return self.parse_file_route(path_tok, path, method)
+
         # Parse optional parameters (REQ_BODY desteği)
         params = self.parse_route_params()
         
@@ -220,6 +226,23 @@ class Parser:
             path = path.strip('"')
         return {'type': 'route', 'path': path, 'method': method, 'params': params, 'body': body}
 
+    def parse_file_route(self, path_tok, path, method):
+        """Parse the tail of a static file route: FILE "openapi.json" [;]"""
+        self.expect('ID', 'FILE')
+        file_tok = self.peek()
+        if file_tok and file_tok[0] == 'STRING':
+            file_path = self.expect('STRING').strip('"')
+        else:
+            raise SyntaxError(f"Expected string for route file, found: {file_tok}")
+        if self.peek() and self.peek()[0] == 'SYMBOL' and self.peek()[1] == ';':
+            self.advance()
+
+        if path_tok[0] == 'TRIPLE_STRING':
+            path = path[3:-3]
+        else:
+            path = path.strip('"')
+        return {'type': 'route', 'path': path, 'method': method, 'params': [], 'body': [], 'file': file_path}
+
     def parse_if(self):
         """Parse if conditions like: if (user > 0) { ... }"""
         self.expect('ID', 'if')
@@ -332,36 +355,42 @@ class Parser:
                 raise SyntaxError(f"Unexpected token in return: {tok}")
         return {'type': 'return', 'parts': parts}
 
-def expr_to_c(expr):
+def var_to_c(name, shared=()):
+    """Globals live in GcState; locals such as route params keep their plain names"""
+    if name in shared:
+        return f'gc_state->{name}'
+    return name
+
+def expr_to_c(expr, shared=()):
     if expr['type'] == 'number':
         return str(expr['value'])
     elif expr['type'] == 'varref':
-        return expr['name']
+        return var_to_c(expr['name'], shared)
     elif expr['type'] == 'arrayref':
-        return f'{expr["name"]}[{expr_to_c(expr["index"])}]'
+        return f'{var_to_c(expr["name"], shared)}[{expr_to_c(expr["index"], shared)}]'
     elif expr['type'] == 'binop':
-        return f'({expr_to_c(expr["left"])} {expr["op"]} {expr_to_c(expr["right"])})'
+        return f'({expr_to_c(expr["left"], shared)} {expr["op"]} {expr_to_c(expr["right"], shared)})'
     else:
         raise Exception("Unknown expr type")
 
-def condition_to_c(condition):
+def condition_to_c(condition, shared=()):
     """Parse conditions like: user > 0, name == "admin" """
     left = condition['left']
     right = condition['right']
     op = condition['op']
 
     if left['type'] == 'varref' and right['type'] == 'varref':
-        return f"{left['name']} {op} {right['name']}"
+        return f"{var_to_c(left['name'], shared)} {op} {var_to_c(right['name'], shared)}"
     elif left['type'] == 'varref' and right['type'] == 'number':
-        return f"{left['name']} {op} {right['value']}"
+        return f"{var_to_c(left['name'], shared)} {op} {right['value']}"
     elif left['type'] == 'number' and right['type'] == 'varref':
-        return f"{left['value']} {op} {right['name']}"
+        return f"{left['value']} {op} {var_to_c(right['name'], shared)}"
     elif left['type'] == 'string' and right['type'] == 'string' and op == '==':
-        return f'strcmp({expr_to_c(left)}, {expr_to_c(right)}) == 0'
+        return f'strcmp({expr_to_c(left, shared)}, {expr_to_c(right, shared)}) == 0'
     else:
-        return f"{expr_to_c(condition['left'])} {op} {expr_to_c(condition['right'])}"
+        return f"{expr_to_c(condition['left'], shared)} {op} {expr_to_c(condition['right'], shared)}"
 
-def return_parts_to_c(parts):
+def return_parts_to_c(parts, shared=()):
     # Build format string and arguments for sprintf
     fmt = ""
     args = []
@@ -371,10 +400,10 @@ def return_parts_to_c(parts):
             fmt += s
         elif part['type'] == 'varref':
             fmt += "%d"
-            args.append(part['name'])
+            args.append(var_to_c(part['name'], shared))
         elif part['type'] == 'arrayref':
             fmt += "%d"
-            args.append(f"{part['name']}[{expr_to_c(part['index'])}]")
+            args.append(f"{var_to_c(part['name'], shared)}[{expr_to_c(part['index'], shared)}]")
     
     if args:
         argstr = ', '.join(args)
@@ -431,40 +460,115 @@ def generate_json_parser(params):
     lines.append("        }")
     return '\n'.join(lines)
 
-def generate_statement_c(stmt):
+FILE_CONTENT_TYPES = {
+    '.json': 'application/json',
+    '.html': 'text/html',
+    '.htm': 'text/html',
+    '.css': 'text/css',
+    '.js': 'application/javascript',
+    '.txt': 'text/plain',
+    '.yaml': 'application/yaml',
+    '.yml': 'application/yaml',
+    '.xml': 'application/xml',
+    '.svg': 'image/svg+xml',
+    '.png': 'image/png',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.ico': 'image/x-icon',
+}
+
+def file_content_type(path):
+    """Pick the Content-Type for a static file route from its extension"""
+    ext = os.path.splitext(path)[1].lower()
+    return FILE_CONTENT_TYPES.get(ext, 'application/octet-stream')
+
+def expr_names(expr):
+    """Collect the variable names an expression reads"""
+    if expr is None:
+        return set()
+    if expr['type'] in ('varref', 'arrayref'):
+        names = {expr['name']}
+        if expr['type'] == 'arrayref':
+            names |= expr_names(expr['index'])
+        return names
+    elif expr['type'] == 'binop':
+        return expr_names(expr['left']) | expr_names(expr['right'])
+    elif expr['type'] == 'compare':
+        return expr_names(expr['left']) | expr_names(expr['right'])
+    return set()
+
+def statement_names(stmt):
+    """Collect the variable names a statement reads or writes"""
+    if stmt['type'] == 'assign':
+        return {stmt['name']} | expr_names(stmt['expr'])
+    elif stmt['type'] == 'call':
+        return {stmt['name'], f"{stmt['name']}_len"} | expr_names(stmt['arg'])
+    elif stmt['type'] == 'return':
+        names = set()
+        for part in stmt['parts']:
+            names |= expr_names(part)
+        return names
+    elif stmt['type'] == 'if':
+        names = expr_names(stmt['condition'])
+        for inner in stmt['then'] + stmt['else']:
+            names |= statement_names(inner)
+        return names
+    return set()
+
+def global_names(api_nodes):
+    """Names of every global, including the _len counters of lists"""
+    names = set()
+    for api in api_nodes:
+        for var in api.get('globals', []):
+            names.add(var['name'])
+            if var['vartype'] == 'list':
+                names.add(f"{var['name']}_len")
+    return names
+
+def list_add_to_c(stmt, shared=()):
+    """users.add(x) appends at users_len"""
+    name = var_to_c(stmt['name'], shared)
+    length = var_to_c(f"{stmt['name']}_len", shared)
+    return f'{name}[{length}++] = {expr_to_c(stmt["arg"], shared)};'
+
+def generate_statement_c(stmt, locked=False, done='continue;', shared=()):
     """Generate C code for a statement"""
     lines = []
     if stmt['type'] == 'assign':
-        lines.append(f'            {stmt["name"]} = {expr_to_c(stmt["expr"])};')
+        lines.append(f'            {var_to_c(stmt["name"], shared)} = {expr_to_c(stmt["expr"], shared)};')
     elif stmt['type'] == 'call' and stmt['func'] == 'add':
-        lines.append(f'            {stmt["name"]}[{stmt["name"]}_len++] = {expr_to_c(stmt["arg"])};')
+        lines.append(f'            {list_add_to_c(stmt, shared)}')
     elif stmt['type'] == 'return':
-        lines.append(f'            {return_parts_to_c(stmt["parts"])}')
+        lines.append(f'            {return_parts_to_c(stmt["parts"], shared)}')
+        if locked:
+            lines.append('            GC_UNLOCK();')
         lines.append('            send_response(client, resp, "application/json", 200);')
         lines.append('            closesocket(client);')
-        lines.append('            continue;')
+        lines.append(f'            {done}')
     elif stmt['type'] == 'if':
-        lines.append(f'            if ({condition_to_c(stmt["condition"])}) {{')
+        lines.append(f'            if ({condition_to_c(stmt["condition"], shared)}) {{')
         for then_stmt in stmt['then']:
-            then_lines = generate_statement_c(then_stmt)
+            then_lines = generate_statement_c(then_stmt, locked, done, shared)
             for line in then_lines:
                 lines.append('    ' + line)  # Add extra indentation
         lines.append('            }')
         if stmt['else']:
             lines.append('            else {')
             for else_stmt in stmt['else']:
-                else_lines = generate_statement_c(else_stmt)
+                else_lines = generate_statement_c(else_stmt, locked, done, shared)
                 for line in else_lines:
                     lines.append('    ' + line)  # Add extra indentation
             lines.append('            }')
     return lines
 
-def gen_c_code(api_nodes):
-    lines = []
-    lines.append(r'''#pragma comment(lib, "ws2_32.lib")
+ROUTES_MODULE = 'output_routes.dll'
+
+C_PRELUDE = r'''#pragma comment(lib, "ws2_32.lib")
+#pragma comment(lib, "mswsock.lib")
 #include <stdio.h>
 #include <string.h>
 #include <winsock2.h>
+#include <mswsock.h>
 #include <ctype.h>
 #include <stdlib.h>
 
@@ -474,25 +578,9 @@ typedef struct {
     int content_length;
     char body[2048];
     char content_type[128];
+    char if_none_match[256];
 } HttpRequest;
 
-void send_response(SOCKET client, const char* content, const char* content_type, int status) {
-    char response[4096];
-    const char* status_text = status == 200 ? "200 OK" : (status == 404 ? "404 Not Found" : "400 Bad Request");
-    sprintf(response, 
-        "HTTP/1.1 %s\r\n"
-        "Content-Type: %s\r\n"
-        "Content-Length: %d\r\n"
-        "Connection: close\r\n"
-        "Access-Control-Allow-Origin: *\r\n"
-        "Access-Control-Allow-Methods: GET, POST, PUT, DELETE\r\n"
-        "Access-Control-Allow-Headers: Content-Type\r\n"
-        "\r\n"
-        "%s", 
-        status_text, content_type, (int)strlen(content), content);
-    send(client, response, (int)strlen(response), 0);
-}
-
 int parse_request(char* req, HttpRequest* out) {
     char method[8], path[256];
     int ret = sscanf(req, "%s %s", method, path);
@@ -502,6 +590,7 @@ int parse_request(char* req, HttpRequest* out) {
     out->content_length = 0;
     out->body[0] = 0;
     out->content_type[0] = 0;
+    out->if_none_match[0] = 0;
 
     char *cl = strstr(req, "Content-Length:");
     if(cl) {
@@ -517,6 +606,14 @@ int parse_request(char* req, HttpRequest* out) {
         while(*ct && *ct!='\r' && *ct!='\n' && i<127) out->content_type[i++] = *ct++;
         out->content_type[i]=0;
     }
+    char *inm = strstr(req, "If-None-Match:");
+    if(inm) {
+        inm += 14;
+        while(*inm == ' ') inm++;
+        int i=0;
+        while(*inm && *inm!='\r' && *inm!='\n' && i<255) out->if_none_match[i++] = *inm++;
+        out->if_none_match[i]=0;
+    }
     char *body_start = strstr(req, "\r\n\r\n");
     if(body_start) {
         body_start += 4;
@@ -527,41 +624,281 @@ int parse_request(char* req, HttpRequest* out) {
     }
     return 1;
 }
-''')
 
-    # Global variables
+// If-None-Match uses weak comparison: "*" or any listed tag, with or without W/, is a match
+int etag_matches(const char* header, const char* etag) {
+    size_t etag_len = strlen(etag);
+    const char* p = header;
+    while (*p) {
+        while (*p == ' ' || *p == '\t' || *p == ',') p++;
+        if (*p == '*') return 1;
+        if (p[0] == 'W' && p[1] == '/') p += 2;
+        if (*p != '"') {
+            while (*p && *p != ',') p++;
+            continue;
+        }
+        const char* end = strchr(p + 1, '"');
+        if (!end) return 0;
+        if ((size_t)(end - p + 1) == etag_len && strncmp(p, etag, etag_len) == 0) return 1;
+        p = end + 1;
+    }
+    return 0;
+}
+
+void send_file(SOCKET client, HttpRequest* req, const char* path, const char* content_type) {
+    BY_HANDLE_FILE_INFORMATION info;
+    HANDLE file = CreateFileA(path, GENERIC_READ, FILE_SHARE_READ | FILE_SHARE_WRITE | FILE_SHARE_DELETE,
+        NULL, OPEN_EXISTING, FILE_FLAG_SEQUENTIAL_SCAN, NULL);
+    if (file == INVALID_HANDLE_VALUE) {
+        send_response(client, "{\"error\":\"404 Not Found\"}", "application/json", 404);
+        return;
+    }
+    if (!GetFileInformationByHandle(file, &info)
+            || (info.dwFileAttributes & FILE_ATTRIBUTE_DIRECTORY) || info.nFileSizeHigh != 0) {
+        CloseHandle(file);
+        send_response(client, "{\"error\":\"404 Not Found\"}", "application/json", 404);
+        return;
+    }
+    char etag[64];
+    sprintf(etag, "\"%lx-%lx%08lx\"", info.nFileSizeLow,
+        info.ftLastWriteTime.dwHighDateTime, info.ftLastWriteTime.dwLowDateTime);
+
+    char header[512];
+    int header_len;
+    if (etag_matches(req->if_none_match, etag)) {
+        header_len = sprintf(header,
+            "HTTP/1.1 304 Not Modified\r\n"
+            "ETag: %s\r\n"
+            "Connection: close\r\n"
+            "Access-Control-Allow-Origin: *\r\n"
+            "\r\n", etag);
+        send(client, header, header_len, 0);
+        CloseHandle(file);
+        return;
+    }
+    header_len = sprintf(header,
+        "HTTP/1.1 200 OK\r\n"
+        "Content-Type: %s\r\n"
+        "Content-Length: %lu\r\n"
+        "ETag: %s\r\n"
+        "Connection: close\r\n"
+        "Access-Control-Allow-Origin: *\r\n"
+        "\r\n", content_type, info.nFileSizeLow, etag);
+
+    // An empty body is just the header; TransmitFile would treat a length of 0 as "whole file"
+    if (info.nFileSizeLow == 0) {
+        send(client, header, header_len, 0);
+        CloseHandle(file);
+        return;
+    }
+
+    // The body goes from the system file cache to the socket via TransmitFile; no user-space copy
+    // and no mapping held between requests, so the file can be rewritten while the server runs
+    TRANSMIT_FILE_BUFFERS head;
+    head.Head = header;
+    head.HeadLength = header_len;
+    head.Tail = NULL;
+    head.TailLength = 0;
+    TransmitFile(client, file, info.nFileSizeLow, 0, NULL, &head, 0);
+    CloseHandle(file);
+}
+'''
+
+def state_signature(api_nodes):
+    """Describe the global declarations; a routes module only loads into a host with the same one"""
+    decls = []
+    for api in api_nodes:
+        for var in api.get('globals', []):
+            if var['vartype'] == 'list':
+                decls.append(f"list {var['subtype']} {var['name']};")
+            else:
+                decls.append(f"{var['vartype']} {var['name']};")
+    return ''.join(decls)
+
+def gen_state_c(api_nodes):
+    """Generate the GcState struct, lock macros and the global name macros"""
+    lines = []
+    # Global variables live in one struct so --workers can place it in shared memory
+    lines.append('typedef struct {')
     for api in api_nodes:
         for var in api.get('globals', []):
             if var['vartype'] == 'int':
-                if var.get('value'):
-                    lines.append(f"int {var['name']} = {expr_to_c(var['value'])};")
-                else:
-                    lines.append(f"int {var['name']} = 0;")
+                lines.append(f"    int {var['name']};")
             elif var['vartype'] == 'string':
-                if var.get('value'):
-                    lines.append(f"char {var['name']}[256] = {expr_to_c(var['value'])};")
-                else:
-                    lines.append(f"char {var['name']}[256] = \"\";")
+                lines.append(f"    char {var['name']}[256];")
             elif var['vartype'] == 'list':
                 if var['subtype'] == 'int':
-                    lines.append(f"int {var['name']}[100]; int {var['name']}_len = 0;")
+                    lines.append(f"    int {var['name']}[100]; int {var['name']}_len;")
                 elif var['subtype'] == 'string':
-                    lines.append(f"char {var['name']}[100][256]; int {var['name']}_len = 0;")
+                    lines.append(f"    char {var['name']}[100][256]; int {var['name']}_len;")
+    lines.append('    int unused;')
+    lines.append('} GcState;')
+    lines.append('')
+    lines.append('GcState gc_local_state;')
+    lines.append('GcState* gc_state = &gc_local_state;')
+    lines.append('HANDLE gc_lock = NULL;')
+    lines.append('#define GC_LOCK() do { if (gc_lock) WaitForSingleObject(gc_lock, INFINITE); } while (0)')
+    lines.append('#define GC_UNLOCK() do { if (gc_lock) ReleaseMutex(gc_lock); } while (0)')
+    lines.append(f'#define GC_STATE_SIGNATURE "{state_signature(api_nodes)}"')
+    return lines
+
+def gen_routes_c(api_nodes, done='continue;'):
+    """Generate the route matching blocks; done is how a handled request leaves the block"""
+    lines = []
+    all_globals = global_names(api_nodes)
+    for api in api_nodes:
+        for route in api['routes']:
+            lines.append(f'        // {route["method"]} {route["path"]}')
+            lines.append(f'        if(strcmp(req.method, "{route["method"]}") == 0 && strcmp(req.path, "{route["path"]}") == 0) {{')
+
+            # Static file routes are served straight from disk
+            if route.get('file'):
+                lines.append(f'            send_file(client, &req, "{route["file"]}", "{file_content_type(route["file"])}");')
+                lines.append('            closesocket(client);')
+                lines.append(f'            {done}')
+                lines.append('        }')
+                continue
+            
+            # Add JSON parameter parsing
+            if route.get('params'):
+                json_parser = generate_json_parser(route['params'])
+                lines.append(json_parser)
+            
+            # Params shadow globals of the same name inside the route
+            shared_names = all_globals - {param['name'] for param in route.get('params', [])}
+
+            # Routes touching globals hold the state lock; returns release it before sending
+            locked = any(statement_names(stmt) & shared_names for stmt in route['body'])
+            if locked:
+                lines.append('            GC_LOCK();')
+
+            # Add route body statements
+            for stmt in route['body']:
+                stmt_lines = generate_statement_c(stmt, locked, done, shared_names)
+                lines.extend(stmt_lines)
+
+            if locked and not (route['body'] and route['body'][-1]['type'] == 'return'):
+                lines.append('            GC_UNLOCK();')
+            lines.append('        }')
+    return lines
+
+def gen_c_code(api_nodes, hot_reload=False):
+    lines = [C_PRELUDE]
+    lines.extend(gen_state_c(api_nodes))
+
+    if hot_reload:
+        lines.append('')
+        lines.append(f'#define GC_ROUTES_MODULE "{ROUTES_MODULE}"')
+        lines.append(r'''
+typedef const char* (*GcSignatureFn)(void);
+typedef void (*GcAttachFn)(GcState*, HANDLE);
+typedef int (*GcDispatchFn)(SOCKET, HttpRequest);
+
+HMODULE gc_routes = NULL;
+GcDispatchFn gc_dispatch = NULL;
+char gc_routes_copy[MAX_PATH];
+FILETIME gc_routes_mtime;
+ULONGLONG gc_routes_checked = 0;
+int gc_routes_version = 0;
+
+// Swap in a rebuilt routes module. A private copy is loaded so the build can replace the original.
+void gc_routes_reload(void) {
+    WIN32_FILE_ATTRIBUTE_DATA info;
+    char copy[MAX_PATH];
+    ULONGLONG now = GetTickCount64();
+    if (now - gc_routes_checked < 250) return;
+    gc_routes_checked = now;
+    if (!GetFileAttributesExA(GC_ROUTES_MODULE, GetFileExInfoStandard, &info)) return;
+    if (CompareFileTime(&info.ftLastWriteTime, &gc_routes_mtime) == 0) return;
+
+    sprintf(copy, "output_routes_%lu_%d.dll", GetCurrentProcessId(), ++gc_routes_version);
+    if (!CopyFileA(GC_ROUTES_MODULE, copy, FALSE)) return;
+    HMODULE module = LoadLibraryA(copy);
+    if (!module) {
+        DeleteFileA(copy);
+        return;
+    }
+    gc_routes_mtime = info.ftLastWriteTime;
+    GcSignatureFn signature = (GcSignatureFn)GetProcAddress(module, "gc_routes_signature");
+    GcAttachFn attach = (GcAttachFn)GetProcAddress(module, "gc_routes_attach");
+    GcDispatchFn dispatch = (GcDispatchFn)GetProcAddress(module, "gc_routes_dispatch");
+    if (!signature || !attach || !dispatch || strcmp(signature(), GC_STATE_SIGNATURE) != 0) {
+        printf("Routes module rejected: global declarations do not match the running server\n");
+        FreeLibrary(module);
+        DeleteFileA(copy);
+        return;
+    }
+    attach(gc_state, gc_lock);
+    if (gc_routes) {
+        FreeLibrary(gc_routes);
+        DeleteFileA(gc_routes_copy);
+    }
+    gc_routes = module;
+    gc_dispatch = dispatch;
+    strcpy(gc_routes_copy, copy);
+    printf("Routes module v%d loaded\n", gc_routes_version);
+}''')
 
     lines.append('')
-    lines.append('int main() {')
+    lines.append('int main(int argc, char** argv) {')
     lines.append(r'''    WSADATA wsa;
     SOCKET server, client;
     struct sockaddr_in server_addr, client_addr;
     int c, recv_size;
     char client_request[4096];
     char resp[2048];
+    int workers = 1;
+    DWORD parent_pid = 0;
+    char state_name[64], lock_name[64];
+
+    for (int i = 1; i < argc; i++) {
+        if (strcmp(argv[i], "--workers") == 0 && i + 1 < argc) {
+            workers = atoi(argv[++i]);
+        } else if (strcmp(argv[i], "--worker") == 0 && i + 1 < argc) {
+            parent_pid = strtoul(argv[++i], NULL, 10);
+        }
+    }
 
-    printf("API server starting...\n");
     if (WSAStartup(MAKEWORD(2,2), &wsa) != 0) {
         printf("WSAStartup failed\n");
         return 1;
     }
+    c = sizeof(struct sockaddr_in);
+
+    // Worker process: rebuild the parent's listener from the WSAPROTOCOL_INFO on stdin
+    // and attach to the parent's shared state
+    if (parent_pid) {
+        WSAPROTOCOL_INFOA protocol;
+        HANDLE input = GetStdHandle(STD_INPUT_HANDLE);
+        DWORD got = 0, n;
+        while (got < sizeof(protocol) && ReadFile(input, (char*)&protocol + got, sizeof(protocol) - got, &n, NULL) && n > 0) got += n;
+        if (got != sizeof(protocol)) {
+            printf("Worker did not receive the listening socket\n");
+            return 1;
+        }
+        server = WSASocketA(FROM_PROTOCOL_INFO, FROM_PROTOCOL_INFO, FROM_PROTOCOL_INFO, &protocol, 0, 0);
+        if (server == INVALID_SOCKET) {
+            printf("Worker could not open the shared listening socket\n");
+            return 1;
+        }
+        sprintf(state_name, "Local\\gcode_state_%lu", parent_pid);
+        sprintf(lock_name, "Local\\gcode_lock_%lu", parent_pid);
+        HANDLE mapping = OpenFileMappingA(FILE_MAP_ALL_ACCESS, FALSE, state_name);
+        gc_lock = OpenMutexA(MUTEX_ALL_ACCESS, FALSE, lock_name);
+        if (!mapping || !gc_lock) {
+            printf("Worker could not attach to shared state\n");
+            return 1;
+        }
+        gc_state = (GcState*)MapViewOfFile(mapping, FILE_MAP_ALL_ACCESS, 0, 0, sizeof(GcState));
+        if (!gc_state) {
+            printf("Worker could not map shared state\n");
+            return 1;
+        }
+        printf("Worker %lu serving...\n", GetCurrentProcessId());
+        goto serve;
+    }
+
+    printf("API server starting...\n");
     if ((server = socket(AF_INET , SOCK_STREAM , 0 )) == INVALID_SOCKET) {
         printf("Socket creation failed\n");
         return 1;
@@ -573,20 +910,104 @@ int parse_request(char* req, HttpRequest* out) {
         printf("Bind failed\n");
         return 1;
     }
-    listen(server , 3);
+    listen(server , workers > 1 ? SOMAXCONN : 3);
     printf("Server listening on port 8080...\n");
-    c = sizeof(struct sockaddr_in);''')
 
-    # Add initialization statements
+    // Multi-process mode: globals move into a named shared mapping guarded by a named mutex
+    if (workers > 1) {
+        sprintf(state_name, "Local\\gcode_state_%lu", GetCurrentProcessId());
+        sprintf(lock_name, "Local\\gcode_lock_%lu", GetCurrentProcessId());
+        HANDLE mapping = CreateFileMappingA(INVALID_HANDLE_VALUE, NULL, PAGE_READWRITE, 0, sizeof(GcState), state_name);
+        gc_lock = CreateMutexA(NULL, FALSE, lock_name);
+        if (!mapping || !gc_lock) {
+            printf("Shared state creation failed\n");
+            return 1;
+        }
+        gc_state = (GcState*)MapViewOfFile(mapping, FILE_MAP_ALL_ACCESS, 0, 0, sizeof(GcState));
+        if (!gc_state) {
+            printf("Shared state mapping failed\n");
+            return 1;
+        }
+    }''')
+
+    # Global initializers and initialization statements run once, before any worker starts
+    shared_names = global_names(api_nodes)
+    for api in api_nodes:
+        for var in api.get('globals', []):
+            if var['vartype'] == 'int' and var.get('value'):
+                lines.append(f"    {var_to_c(var['name'], shared_names)} = {expr_to_c(var['value'], shared_names)};")
+            elif var['vartype'] == 'string' and var.get('value'):
+                lines.append(f"    strcpy({var_to_c(var['name'], shared_names)}, {expr_to_c(var['value'], shared_names)});")
     for api in api_nodes:
         for stmt in api.get('inits', []):
             if stmt['type'] == 'call' and stmt['func'] == 'add':
-                lines.append(f'    {stmt["name"]}[{stmt["name"]}_len++] = {expr_to_c(stmt["arg"])};')
+                lines.append(f'    {list_add_to_c(stmt, shared_names)}')
             elif stmt['type'] == 'assign':
-                lines.append(f'    {stmt["name"]} = {expr_to_c(stmt["expr"])};')
+                lines.append(f'    {var_to_c(stmt["name"], shared_names)} = {expr_to_c(stmt["expr"], shared_names)};')
         # 'noop' için hiçbir şey ekleme
 
+    lines.append(r'''
+    // Spawn workers-1 children; each gets the listener via WSADuplicateSocket over a stdin pipe.
+    // A kill-on-close job takes them down with us.
+    if (workers > 1) {
+        char exe[MAX_PATH], cmd[MAX_PATH + 64];
+        HANDLE job = CreateJobObjectA(NULL, NULL);
+        JOBOBJECT_EXTENDED_LIMIT_INFORMATION limits;
+        memset(&limits, 0, sizeof(limits));
+        limits.BasicLimitInformation.LimitFlags = JOB_OBJECT_LIMIT_KILL_ON_JOB_CLOSE;
+        if (job) SetInformationJobObject(job, JobObjectExtendedLimitInformation, &limits, sizeof(limits));
+        SetHandleInformation((HANDLE)server, HANDLE_FLAG_INHERIT, 0);
+        GetModuleFileNameA(NULL, exe, MAX_PATH);
+        int started = 0;
+        for (int i = 1; i < workers; i++) {
+            STARTUPINFOA si;
+            PROCESS_INFORMATION pi;
+            SECURITY_ATTRIBUTES sa;
+            WSAPROTOCOL_INFOA protocol;
+            HANDLE pipe_read, pipe_write;
+            DWORD written;
+            sa.nLength = sizeof(sa);
+            sa.lpSecurityDescriptor = NULL;
+            sa.bInheritHandle = TRUE;
+            if (!CreatePipe(&pipe_read, &pipe_write, &sa, 0)) {
+                printf("Worker %d failed to start\n", i);
+                continue;
+            }
+            SetHandleInformation(pipe_write, HANDLE_FLAG_INHERIT, 0);
+            memset(&si, 0, sizeof(si));
+            si.cb = sizeof(si);
+            si.dwFlags = STARTF_USESTDHANDLES;
+            si.hStdInput = pipe_read;
+            si.hStdOutput = GetStdHandle(STD_OUTPUT_HANDLE);
+            si.hStdError = GetStdHandle(STD_ERROR_HANDLE);
+            sprintf(cmd, "\"%s\" --worker %lu", exe, GetCurrentProcessId());
+            if (!CreateProcessA(exe, cmd, NULL, NULL, TRUE, 0, NULL, NULL, &si, &pi)) {
+                printf("Worker %d failed to start\n", i);
+                CloseHandle(pipe_read);
+                CloseHandle(pipe_write);
+                continue;
+            }
+            CloseHandle(pipe_read);
+            if (job) AssignProcessToJobObject(job, pi.hProcess);
+            if (WSADuplicateSocketA(server, pi.dwProcessId, &protocol) != 0
+                    || !WriteFile(pipe_write, &protocol, sizeof(protocol), &written, NULL)) {
+                // Without the socket info the worker reads EOF on stdin and exits
+                printf("Worker %d could not receive the listening socket\n", i);
+            } else {
+                started++;
+            }
+            CloseHandle(pipe_write);
+            CloseHandle(pi.hThread);
+            CloseHandle(pi.hProcess);
+        }
+        printf("Started %d of %d worker processes alongside this one\n", started, workers - 1);
+    }''')
+
     lines.append('')
+    lines.append('serve:')
+    if hot_reload:
+        # Load the routes module before the first accept so no request pays for it
+        lines.append('    gc_routes_reload();')
     lines.append(r'''    while((client = accept(server , (struct sockaddr *)&client_addr, &c)) != INVALID_SOCKET) {
         recv_size = recv(client , client_request , sizeof(client_request)-1 , 0);
         if (recv_size == SOCKET_ERROR || recv_size == 0) {
@@ -604,23 +1025,13 @@ int parse_request(char* req, HttpRequest* out) {
         printf("Request: %s %s\n", req.method, req.path);
 ''')
 
-    # Routes
-    for api in api_nodes:
-        for route in api['routes']:
-            lines.append(f'        // {route["method"]} {route["path"]}')
-            lines.append(f'        if(strcmp(req.method, "{route["method"]}") == 0 && strcmp(req.path, "{route["path"]}") == 0) {{')
-            
-            # Add JSON parameter parsing
-            if route.get('params'):
-                json_parser = generate_json_parser(route['params'])
-                lines.append(json_parser)
-            
-            # Add route body statements
-            for stmt in route['body']:
-                stmt_lines = generate_statement_c(stmt)
-                lines.extend(stmt_lines)
-            
-            lines.append('        }')
+    if hot_reload:
+        # Routes live in the reloadable module; the host keeps the listener and the globals
+        lines.append('        gc_routes_reload();')
+        lines.append('        if (gc_dispatch && gc_dispatch(client, req)) continue;')
+        lines.append('')
+    else:
+        lines.extend(gen_routes_c(api_nodes))
 
     lines.append(r'''        // Default 404 response
         send_response(client, "{\"error\":\"404 Not Found\"}", "application/json", 404);
@@ -632,20 +1043,36 @@ int parse_request(char* req, HttpRequest* out) {
 }''')
     return '\n'.join(lines)
 
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: python main.py <file.gcode> [--run]")
-        return
+def gen_routes_module_c(api_nodes):
+    """Generate the hot-reloadable routes module loaded by a --watch host"""
+    lines = [C_PRELUDE]
+    lines.extend(gen_state_c(api_nodes))
+    lines.append(r'''
+__declspec(dllexport) const char* gc_routes_signature(void) {
+    return GC_STATE_SIGNATURE;
+}
 
-    filename = sys.argv[1]
-    run_after = '--run' in sys.argv
+__declspec(dllexport) void gc_routes_attach(GcState* state, HANDLE lock) {
+    gc_state = state;
+    gc_lock = lock;
+}
 
+__declspec(dllexport) int gc_routes_dispatch(SOCKET client, HttpRequest req) {
+    char resp[2048];
+''')
+    lines.extend(gen_routes_c(api_nodes, done='return 1;'))
+    lines.append('    return 0;')
+    lines.append('}')
+    return '\n'.join(lines)
+
+def read_api(filename):
+    """Read and parse a .gcode file; returns the API nodes, or None after reporting the error"""
     try:
         with open(filename, 'r', encoding='utf-8') as f:
             code = f.read()
     except FileNotFoundError:
         print(f"Error: File {filename} not found")
-        return
+        return None
 
     tokens = tokenize(code)
     parser = Parser(tokens)
@@ -653,54 +1080,188 @@ def main():
         api_nodes = parser.parse()
         if not api_nodes:
             print("Error: No API definition found")
-            return
+            return None
     except Exception as e:
         print(f"Parsing error: {e}")
-        return
-
-    c_code = gen_c_code(api_nodes)
+        return None
+    return api_nodes
 
-    c_file = 'output.c'
-    with open(c_file, 'w', encoding='utf-8') as f:
-        f.write(c_code)
+def compile_c(c_file, output, shared=False):
+    """Try the known compilers in turn; returns True once one of them succeeds"""
+    if shared:
+        compilers = [
+            ['gcc', '-shared', c_file, '-o', f'{output}.dll', '-lws2_32', '-lmswsock'],
+            ['clang', '-shared', c_file, '-o', f'{output}.dll', '-lws2_32', '-lmswsock'],
+            ['cl', '/LD', c_file, f'/Fe:{output}.dll', 'ws2_32.lib', 'mswsock.lib']
+        ]
+    else:
+        compilers = [
+            ['gcc', c_file, '-o', f'{output}.exe', '-lws2_32', '-lmswsock'],
+            ['gcc', c_file, '-o', output, '-lws2_32', '-lmswsock'],
+            ['clang', c_file, '-o', f'{output}.exe', '-lws2_32', '-lmswsock'],
+            ['cl', c_file, f'/Fe:{output}.exe', 'ws2_32.lib', 'mswsock.lib']
+        ]
 
-    print("Compiling...")
-    # Try different compiler commands
-    compilers = [
-        ['gcc', c_file, '-o', 'output.exe', '-lws2_32'],
-        ['gcc', c_file, '-o', 'output', '-lws2_32'],
-        ['clang', c_file, '-o', 'output.exe', '-lws2_32'],
-        ['cl', c_file, '/Fe:output.exe', 'ws2_32.lib']
-    ]
-    
-    compiled = False
     for gcc_cmd in compilers:
         try:
             proc = subprocess.run(gcc_cmd, capture_output=True, timeout=30)
             if proc.returncode == 0:
                 print(f"Compilation successful with: {' '.join(gcc_cmd)}")
-                compiled = True
-                break
+                return True
             else:
                 continue
         except (subprocess.TimeoutExpired, FileNotFoundError):
             continue
-    
-    if not compiled:
+    return False
+
+def build_server(api_nodes, hot_reload=False):
+    c_code = gen_c_code(api_nodes, hot_reload)
+
+    c_file = 'output.c'
+    with open(c_file, 'w', encoding='utf-8') as f:
+        f.write(c_code)
+
+    print("Compiling...")
+    if not compile_c(c_file, 'output'):
         print("Compilation failed. Make sure you have GCC or another C compiler installed.")
         print("On Windows, you may need to install MinGW-w64 or Visual Studio.")
+        return False
+    return True
+
+def build_routes_module(api_nodes):
+    c_file = 'output_routes.c'
+    with open(c_file, 'w', encoding='utf-8') as f:
+        f.write(gen_routes_module_c(api_nodes))
+
+    # Build under a temporary name so the running host never copies a half-written module
+    if not compile_c(c_file, 'output_routes_build', shared=True):
+        print("Routes module compilation failed.")
+        return False
+    return True
+
+def install_routes_module():
+    """Move a freshly built module into place; False if the host was holding the file open"""
+    try:
+        os.replace('output_routes_build.dll', ROUTES_MODULE)
+    except OSError as e:
+        print(f"Could not install routes module ({e}), retrying...")
+        return False
+    return True
+
+def remove_module_copies():
+    """Delete the private module copies a host leaves behind once it has exited"""
+    for path in glob.glob('output_routes_*.dll'):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+def wait_for_release(executable, timeout=10.0):
+    """Wait until no process runs the server image. With --workers, the workers
+    exit only after the parent does, when its kill-on-close job handle goes away."""
+    deadline = time.time() + timeout
+    while True:
+        try:
+            with open(executable, 'ab'):
+                return True
+        except FileNotFoundError:
+            return True
+        except OSError:
+            if time.time() >= deadline:
+                print(f"Warning: {executable} is still in use by server processes")
+                return False
+            time.sleep(0.1)
+
+def watch(filename, api_nodes, executable, server_args):
+    """Rebuild the routes module on every spec change; restart only when the globals change"""
+    signature = state_signature(api_nodes)
+    mtime = os.path.getmtime(filename)
+    pending_install = False
+    print("Starting server in watch mode...")
+    server = subprocess.Popen([executable] + server_args)
+    try:
+        while True:
+            time.sleep(0.5)
+            if pending_install and install_routes_module():
+                pending_install = False
+                print("Routes module rebuilt, server will swap it in on the next request")
+            try:
+                current = os.path.getmtime(filename)
+            except OSError:
+                continue
+            if current == mtime:
+                continue
+            mtime = current
+
+            api_nodes = read_api(filename)
+            if api_nodes is None:
+                continue
+            if server is None or state_signature(api_nodes) != signature:
+                if server is not None:
+                    print("Global declarations changed, restarting server...")
+                    server.terminate()
+                    server.wait()
+                    server = None
+                    wait_for_release(executable)
+                if (build_server(api_nodes, hot_reload=True) and build_routes_module(api_nodes)
+                        and install_routes_module()):
+                    pending_install = False
+                    signature = state_signature(api_nodes)
+                    server = subprocess.Popen([executable] + server_args)
+            elif build_routes_module(api_nodes):
+                if install_routes_module():
+                    pending_install = False
+                    print("Routes module rebuilt, server will swap it in on the next request")
+                else:
+                    pending_install = True
+    except KeyboardInterrupt:
+        print("\nServer stopped.")
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+            wait_for_release(executable)
+        remove_module_copies()
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python main.py <file.gcode> [--run] [--watch] [--workers N]")
+        return
+
+    filename = sys.argv[1]
+    run_after = '--run' in sys.argv
+    watch_spec = '--watch' in sys.argv
+    server_args = []
+    if '--workers' in sys.argv:
+        idx = sys.argv.index('--workers')
+        if idx + 1 >= len(sys.argv) or not sys.argv[idx + 1].isdigit():
+            print("Error: --workers expects a process count")
+            return
+        server_args = ['--workers', sys.argv[idx + 1]]
+
+    api_nodes = read_api(filename)
+    if api_nodes is None:
+        return
+
+    if not build_server(api_nodes, hot_reload=watch_spec):
+        return
+    if watch_spec and not (build_routes_module(api_nodes) and install_routes_module()):
         return
 
     executable = 'output.exe' if os.name == 'nt' else './output'
-    
+
+    if watch_spec:
+        watch(filename, api_nodes, executable, server_args)
+        return
+
     if run_after:
         print("Starting server...")
         try:
-            subprocess.run([executable])
+            subprocess.run([executable] + server_args)
         except KeyboardInterrupt:
             print("\nServer stopped.")
         except FileNotFoundError:
             print(f"Error: Could not find executable {executable}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
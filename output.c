@@ -1,7 +1,9 @@
 #pragma comment(lib, "ws2_32.lib")
+#pragma comment(lib, "mswsock.lib")
 #include <stdio.h>
 #include <string.h>
 #include <winsock2.h>
+#include <mswsock.h>
 #include <ctype.h>
 #include <stdlib.h>
 
@@ -11,25 +13,9 @@ typedef struct {
     int content_length;
     char body[2048];
     char content_type[128];
+    char if_none_match[256];
 } HttpRequest;
 
-void send_response(SOCKET client, const char* content, const char* content_type, int status) {
-    char response[4096];
-    const char* status_text = status == 200 ? "200 OK" : (status == 404 ? "404 Not Found" : "400 Bad Request");
-    sprintf(response, 
-        "HTTP/1.1 %s\r\n"
-        "Content-Type: %s\r\n"
-        "Content-Length: %d\r\n"
-        "Connection: close\r\n"
-        "Access-Control-Allow-Origin: *\r\n"
-        "Access-Control-Allow-Methods: GET, POST, PUT, DELETE\r\n"
-        "Access-Control-Allow-Headers: Content-Type\r\n"
-        "\r\n"
-        "%s", 
-        status_text, content_type, (int)strlen(content), content);
-    send(client, response, (int)strlen(response), 0);
-}
-
 int parse_request(char* req, HttpRequest* out) {
     char method[8], path[256];
     int ret = sscanf(req, "%s %s", method, path);
@@ -39,6 +25,7 @@ int parse_request(char* req, HttpRequest* out) {
     out->content_length = 0;
     out->body[0] = 0;
     out->content_type[0] = 0;
+    out->if_none_match[0] = 0;
 
     char *cl = strstr(req, "Content-Length:");
     if(cl) {
@@ -54,6 +41,14 @@ int parse_request(char* req, HttpRequest* out) {
         while(*ct && *ct!='\r' && *ct!='\n' && i<127) out->content_type[i++] = *ct++;
         out->content_type[i]=0;
     }
+    char *inm = strstr(req, "If-None-Match:");
+    if(inm) {
+        inm += 14;
+        while(*inm == ' ') inm++;
+        int i=0;
+        while(*inm && *inm!='\r' && *inm!='\n' && i<255) out->if_none_match[i++] = *inm++;
+        out->if_none_match[i]=0;
+    }
     char *body_start = strstr(req, "\r\n\r\n");
     if(body_start) {
         body_start += 4;
@@ -65,22 +60,156 @@ int parse_request(char* req, HttpRequest* out) {
     return 1;
 }
 
-int users[100]; int users_len = 0;
-int total_added = 0;
+// If-None-Match uses weak comparison: "*" or any listed tag, with or without W/, is a match
+int etag_matches(const char* header, const char* etag) {
+    size_t etag_len = strlen(etag);
+    const char* p = header;
+    while (*p) {
+        while (*p == ' ' || *p == '\t' || *p == ',') p++;
+        if (*p == '*') return 1;
+        if (p[0] == 'W' && p[1] == '/') p += 2;
+        if (*p != '"') {
+            while (*p && *p != ',') p++;
+            continue;
+        }
+        const char* end = strchr(p + 1, '"');
+        if (!end) return 0;
+        if ((size_t)(end - p + 1) == etag_len && strncmp(p, etag, etag_len) == 0) return 1;
+        p = end + 1;
+    }
+    return 0;
+}
+
+void send_file(SOCKET client, HttpRequest* req, const char* path, const char* content_type) {
+    BY_HANDLE_FILE_INFORMATION info;
+    HANDLE file = CreateFileA(path, GENERIC_READ, FILE_SHARE_READ | FILE_SHARE_WRITE | FILE_SHARE_DELETE,
+        NULL, OPEN_EXISTING, FILE_FLAG_SEQUENTIAL_SCAN, NULL);
+    if (file == INVALID_HANDLE_VALUE) {
+        send_response(client, "{\"error\":\"404 Not Found\"}", "application/json", 404);
+        return;
+    }
+    if (!GetFileInformationByHandle(file, &info)
+            || (info.dwFileAttributes & FILE_ATTRIBUTE_DIRECTORY) || info.nFileSizeHigh != 0) {
+        CloseHandle(file);
+        send_response(client, "{\"error\":\"404 Not Found\"}", "application/json", 404);
+        return;
+    }
+    char etag[64];
+    sprintf(etag, "\"%lx-%lx%08lx\"", info.nFileSizeLow,
+        info.ftLastWriteTime.dwHighDateTime, info.ftLastWriteTime.dwLowDateTime);
+
+    char header[512];
+    int header_len;
+    if (etag_matches(req->if_none_match, etag)) {
+        header_len = sprintf(header,
+            "HTTP/1.1 304 Not Modified\r\n"
+            "ETag: %s\r\n"
+            "Connection: close\r\n"
+            "Access-Control-Allow-Origin: *\r\n"
+            "\r\n", etag);
+        send(client, header, header_len, 0);
+        CloseHandle(file);
+        return;
+    }
+    header_len = sprintf(header,
+        "HTTP/1.1 200 OK\r\n"
+        "Content-Type: %s\r\n"
+        "Content-Length: %lu\r\n"
+        "ETag: %s\r\n"
+        "Connection: close\r\n"
+        "Access-Control-Allow-Origin: *\r\n"
+        "\r\n", content_type, info.nFileSizeLow, etag);
+
+    // An empty body is just the header; TransmitFile would treat a length of 0 as "whole file"
+    if (info.nFileSizeLow == 0) {
+        send(client, header, header_len, 0);
+        CloseHandle(file);
+        return;
+    }
+
+    // The body goes from the system file cache to the socket via TransmitFile; no user-space copy
+    // and no mapping held between requests, so the file can be rewritten while the server runs
+    TRANSMIT_FILE_BUFFERS head;
+    head.Head = header;
+    head.HeadLength = header_len;
+    head.Tail = NULL;
+    head.TailLength = 0;
+    TransmitFile(client, file, info.nFileSizeLow, 0, NULL, &head, 0);
+    CloseHandle(file);
+}
+
+typedef struct {
+    int users[100]; int users_len;
+    int total_added;
+    int unused;
+} GcState;
 
-int main() {
+GcState gc_local_state;
+GcState* gc_state = &gc_local_state;
+HANDLE gc_lock = NULL;
+#define GC_LOCK() do { if (gc_lock) WaitForSingleObject(gc_lock, INFINITE); } while (0)
+#define GC_UNLOCK() do { if (gc_lock) ReleaseMutex(gc_lock); } while (0)
+#define GC_STATE_SIGNATURE "list int users;int total_added;"
+
+int main(int argc, char** argv) {
     WSADATA wsa;
     SOCKET server, client;
     struct sockaddr_in server_addr, client_addr;
     int c, recv_size;
     char client_request[4096];
     char resp[2048];
+    int workers = 1;
+    DWORD parent_pid = 0;
+    char state_name[64], lock_name[64];
+
+    for (int i = 1; i < argc; i++) {
+        if (strcmp(argv[i], "--workers") == 0 && i + 1 < argc) {
+            workers = atoi(argv[++i]);
+        } else if (strcmp(argv[i], "--worker") == 0 && i + 1 < argc) {
+            parent_pid = strtoul(argv[++i], NULL, 10);
+        }
+    }
 
-    printf("API server starting...\n");
     if (WSAStartup(MAKEWORD(2,2), &wsa) != 0) {
         printf("WSAStartup failed\n");
         return 1;
     }
+    c = sizeof(struct sockaddr_in);
+
+    // Worker process: rebuild the parent's listener from the WSAPROTOCOL_INFO on stdin
+    // and attach to the parent's shared state
+    if (parent_pid) {
+        WSAPROTOCOL_INFOA protocol;
+        HANDLE input = GetStdHandle(STD_INPUT_HANDLE);
+        DWORD got = 0, n;
+        while (got < sizeof(protocol) && ReadFile(input, (char*)&protocol + got, sizeof(protocol) - got, &n, NULL) && n > 0) got += n;
+        if (got != sizeof(protocol)) {
+            printf("Worker did not receive the listening socket\n");
+            return 1;
+        }
+        server = WSASocketA(FROM_PROTOCOL_INFO, FROM_PROTOCOL_INFO, FROM_PROTOCOL_INFO, &protocol, 0, 0);
+        if (server == INVALID_SOCKET) {
+            printf("Worker could not open the shared listening socket\n");
+            return 1;
+        }
+        sprintf(state_name, "Local\\gcode_state_%lu", parent_pid);
+        sprintf(lock_name, "Local\\gcode_lock_%lu", parent_pid);
+        HANDLE mapping = OpenFileMappingA(FILE_MAP_ALL_ACCESS, FALSE, state_name);
+        gc_lock = OpenMutexA(MUTEX_ALL_ACCESS, FALSE, lock_name);
+        if (!mapping || !gc_lock) {
+            printf("Worker could not attach to shared state\n");
+            return 1;
+        }
+        gc_state = (GcState*)MapViewOfFile(mapping, FILE_MAP_ALL_ACCESS, 0, 0, sizeof(GcState));
+        if (!gc_state) {
+            printf("Worker could not map shared state\n");
+            return 1;
+        }
+        printf("Worker %lu serving...\n", GetCurrentProcessId());
+        goto serve;
+    }
+
+    printf("API server starting...\n");
     if ((server = socket(AF_INET , SOCK_STREAM , 0 )) == INVALID_SOCKET) {
         printf("Socket creation failed\n");
         return 1;
@@ -92,12 +221,86 @@ int main() {
         printf("Bind failed\n");
         return 1;
     }
-    listen(server , 3);
+    listen(server , workers > 1 ? SOMAXCONN : 3);
     printf("Server listening on port 8080...\n");
-    c = sizeof(struct sockaddr_in);
-    users[users_len++] = 10;
-    users[users_len++] = 20;
 
+    // Multi-process mode: globals move into a named shared mapping guarded by a named mutex
+    if (workers > 1) {
+        sprintf(state_name, "Local\\gcode_state_%lu", GetCurrentProcessId());
+        sprintf(lock_name, "Local\\gcode_lock_%lu", GetCurrentProcessId());
+        HANDLE mapping = CreateFileMappingA(INVALID_HANDLE_VALUE, NULL, PAGE_READWRITE, 0, sizeof(GcState), state_name);
+        gc_lock = CreateMutexA(NULL, FALSE, lock_name);
+        if (!mapping || !gc_lock) {
+            printf("Shared state creation failed\n");
+            return 1;
+        }
+        gc_state = (GcState*)MapViewOfFile(mapping, FILE_MAP_ALL_ACCESS, 0, 0, sizeof(GcState));
+        if (!gc_state) {
+            printf("Shared state mapping failed\n");
+            return 1;
+        }
+    }
+    gc_state->total_added = 0;
+    gc_state->users[gc_state->users_len++] = 10;
+    gc_state->users[gc_state->users_len++] = 20;
+
+    // Spawn workers-1 children; each gets the listener via WSADuplicateSocket over a stdin pipe.
+    // A kill-on-close job takes them down with us.
+    if (workers > 1) {
+        char exe[MAX_PATH], cmd[MAX_PATH + 64];
+        HANDLE job = CreateJobObjectA(NULL, NULL);
+        JOBOBJECT_EXTENDED_LIMIT_INFORMATION limits;
+        memset(&limits, 0, sizeof(limits));
+        limits.BasicLimitInformation.LimitFlags = JOB_OBJECT_LIMIT_KILL_ON_JOB_CLOSE;
+        if (job) SetInformationJobObject(job, JobObjectExtendedLimitInformation, &limits, sizeof(limits));
+        SetHandleInformation((HANDLE)server, HANDLE_FLAG_INHERIT, 0);
+        GetModuleFileNameA(NULL, exe, MAX_PATH);
+        int started = 0;
+        for (int i = 1; i < workers; i++) {
+            STARTUPINFOA si;
+            PROCESS_INFORMATION pi;
+            SECURITY_ATTRIBUTES sa;
+            WSAPROTOCOL_INFOA protocol;
+            HANDLE pipe_read, pipe_write;
+            DWORD written;
+            sa.nLength = sizeof(sa);
+            sa.lpSecurityDescriptor = NULL;
+            sa.bInheritHandle = TRUE;
+            if (!CreatePipe(&pipe_read, &pipe_write, &sa, 0)) {
+                printf("Worker %d failed to start\n", i);
+                continue;
+            }
+            SetHandleInformation(pipe_write, HANDLE_FLAG_INHERIT, 0);
+            memset(&si, 0, sizeof(si));
+            si.cb = sizeof(si);
+            si.dwFlags = STARTF_USESTDHANDLES;
+            si.hStdInput = pipe_read;
+            si.hStdOutput = GetStdHandle(STD_OUTPUT_HANDLE);
+            si.hStdError = GetStdHandle(STD_ERROR_HANDLE);
+            sprintf(cmd, "\"%s\" --worker %lu", exe, GetCurrentProcessId());
+            if (!CreateProcessA(exe, cmd, NULL, NULL, TRUE, 0, NULL, NULL, &si, &pi)) {
+                printf("Worker %d failed to start\n", i);
+                CloseHandle(pipe_read);
+                CloseHandle(pipe_write);
+                continue;
+            }
+            CloseHandle(pipe_read);
+            if (job) AssignProcessToJobObject(job, pi.hProcess);
+            if (WSADuplicateSocketA(server, pi.dwProcessId, &protocol) != 0
+                    || !WriteFile(pipe_write, &protocol, sizeof(protocol), &written, NULL)) {
+                // Without the socket info the worker reads EOF on stdin and exits
+                printf("Worker %d could not receive the listening socket\n", i);
+            } else {
+                started++;
+            }
+            CloseHandle(pipe_write);
+            CloseHandle(pi.hThread);
+            CloseHandle(pi.hProcess);
+        }
+        printf("Started %d of %d worker processes alongside this one\n", started, workers - 1);
+    }
+
+serve:
     while((client = accept(server , (struct sockaddr *)&client_addr, &c)) != INVALID_SOCKET) {
         recv_size = recv(client , client_request , sizeof(client_request)-1 , 0);
         if (recv_size == SOCKET_ERROR || recv_size == 0) {
@@ -149,22 +352,28 @@ int main() {
                 }
             }
         }
-            users[users_len++] = newuser;
-            sprintf(resp, "{\\\"success\\\": true, \\\"added\\\": %d, \\\"total\\\": %d, \\\"count\\\": %d}", users[(users_len - 1)], total_added, users_len);
+            GC_LOCK();
+            gc_state->users[gc_state->users_len++] = newuser;
+            sprintf(resp, "{\\\"success\\\": true, \\\"added\\\": %d, \\\"total\\\": %d, \\\"count\\\": %d}", gc_state->users[(gc_state->users_len - 1)], gc_state->total_added, gc_state->users_len);
+            GC_UNLOCK();
             send_response(client, resp, "application/json", 200);
             closesocket(client);
             continue;
         }
         // GET /all
         if(strcmp(req.method, "GET") == 0 && strcmp(req.path, "/all") == 0) {
-            sprintf(resp, "{\\\"users\\\": [%d,%d,%d,%d,%d], \\\"count\\\": %d}", users[0], users[1], users[2], users[3], users[4], users_len);
+            GC_LOCK();
+            sprintf(resp, "{\\\"users\\\": [%d,%d,%d,%d,%d], \\\"count\\\": %d}", gc_state->users[0], gc_state->users[1], gc_state->users[2], gc_state->users[3], gc_state->users[4], gc_state->users_len);
+            GC_UNLOCK();
             send_response(client, resp, "application/json", 200);
             closesocket(client);
             continue;
         }
         // GET /count
         if(strcmp(req.method, "GET") == 0 && strcmp(req.path, "/count") == 0) {
-            sprintf(resp, "{\\\"count\\\": %d}", users_len);
+            GC_LOCK();
+            sprintf(resp, "{\\\"count\\\": %d}", gc_state->users_len);
+            GC_UNLOCK();
             send_response(client, resp, "application/json", 200);
             closesocket(client);
             continue;
@@ -178,27 +387,33 @@ int main() {
         }
         // GET /last
         if(strcmp(req.method, "GET") == 0 && strcmp(req.path, "/last") == 0) {
-            sprintf(resp, "{\\\"last\\\": %d}", users[(users_len - 1)]);
+            GC_LOCK();
+            sprintf(resp, "{\\\"last\\\": %d}", gc_state->users[(gc_state->users_len - 1)]);
+            GC_UNLOCK();
             send_response(client, resp, "application/json", 200);
             closesocket(client);
             continue;
         }
         // POST /reset
         if(strcmp(req.method, "POST") == 0 && strcmp(req.path, "/reset") == 0) {
-            if (users_len > 2) {
-                users_len = 2;
-                total_added = 0;
-                sprintf(resp, "{\\\"reset\\\": true, \\\"count\\\": %d}", users_len);
+            GC_LOCK();
+            if (gc_state->users_len > 2) {
+                gc_state->users_len = 2;
+                gc_state->total_added = 0;
+                sprintf(resp, "{\\\"reset\\\": true, \\\"count\\\": %d}", gc_state->users_len);
+                GC_UNLOCK();
                 send_response(client, resp, "application/json", 200);
                 closesocket(client);
                 continue;
             }
             else {
-                sprintf(resp, "{\\\"reset\\\": false, \\\"count\\\": %d}", users_len);
+                sprintf(resp, "{\\\"reset\\\": false, \\\"count\\\": %d}", gc_state->users_len);
+                GC_UNLOCK();
                 send_response(client, resp, "application/json", 200);
                 closesocket(client);
                 continue;
             }
+            GC_UNLOCK();
         }
         // Default 404 response
         send_response(client, "{\"error\":\"404 Not Found\"}", "application/json", 404);